@@ -1,16 +1,41 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
+import numpy as np
+import orjson
 from pydantic import BaseModel
 from sentence_transformers import SentenceTransformer
-from qdrant_client import QdrantClient
-from qdrant_client.http.models import Distance, VectorParams, PointStruct
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import (
+    Distance,
+    PointStruct,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    VectorParams,
+)
 import uvicorn
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+import asyncio
+import base64
+import hashlib
 import logging
 import os
 import uuid
 
-# Configure logging
+from export_model import (
+    MODEL_NAME,
+    QUANTIZED_MODEL_FILES,
+    export_quantized_model,
+    read_export_info,
+)
+
+# Configure logging - per-request messages are logged at DEBUG level
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 logging.basicConfig(
-    level=logging.INFO,
+    level=LOG_LEVEL,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
@@ -22,40 +47,409 @@ app = FastAPI(
     version="1.0.0"
 )
 
-# Initialize the model - using MPNet which produces 768-dimensional vectors
-logger.info("Loading model sentence-transformers/all-mpnet-base-v2...")
-model = SentenceTransformer('sentence-transformers/all-mpnet-base-v2')
+# Inference backend: "onnx" (default), "openvino" for Intel CPUs, or "torch"
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "onnx").lower()
+# Where quantized models are exported when the hub repo does not ship them
+MODEL_EXPORT_DIR = os.getenv(
+    "MODEL_EXPORT_DIR", os.path.join("/models", MODEL_NAME.split("/")[-1])
+)
+# Set in the Docker image, where only the model baked at build time is available
+HF_HUB_OFFLINE = os.getenv("HF_HUB_OFFLINE", "").upper() in ("1", "ON", "YES", "TRUE")
+
+def load_model() -> SentenceTransformer:
+    """
+    Load the embedding model through EMBEDDING_BACKEND with int8 weights.
+    Prefers a model already exported into MODEL_EXPORT_DIR, then the hub's
+    quantized files, and finally exports the quantized model once so later
+    starts can reload it from disk.
+    """
+    if EMBEDDING_BACKEND == "torch":
+        logger.info(f"Loading model {MODEL_NAME} with torch backend...")
+        return SentenceTransformer(MODEL_NAME)
+    if EMBEDDING_BACKEND not in QUANTIZED_MODEL_FILES:
+        raise ValueError(f"Unsupported EMBEDDING_BACKEND: {EMBEDDING_BACKEND}")
+
+    exported_model = read_export_info(MODEL_EXPORT_DIR).get("model")
+    if exported_model and exported_model != MODEL_NAME:
+        raise RuntimeError(
+            f"{MODEL_EXPORT_DIR} holds an export of {exported_model}, not {MODEL_NAME}; "
+            f"rebuild the image with EMBED_MODEL={MODEL_NAME} or set MODEL_EXPORT_DIR "
+            f"to another directory"
+        )
+
+    model_kwargs = {"file_name": QUANTIZED_MODEL_FILES[EMBEDDING_BACKEND]}
+    exported_file = os.path.join(MODEL_EXPORT_DIR, model_kwargs["file_name"])
+    if os.path.exists(exported_file):
+        logger.info(f"Loading quantized {EMBEDDING_BACKEND} model from {MODEL_EXPORT_DIR}...")
+        return SentenceTransformer(
+            MODEL_EXPORT_DIR,
+            backend=EMBEDDING_BACKEND,
+            model_kwargs=model_kwargs
+        )
+
+    if HF_HUB_OFFLINE:
+        raise RuntimeError(
+            f"No quantized {EMBEDDING_BACKEND} export of {MODEL_NAME} in {MODEL_EXPORT_DIR} "
+            f"and the Hugging Face hub is offline; rebuild the image with "
+            f"EMBEDDING_BACKEND={EMBEDDING_BACKEND}"
+        )
+
+    try:
+        logger.info(f"Loading quantized {EMBEDDING_BACKEND} model {MODEL_NAME}...")
+        return SentenceTransformer(
+            MODEL_NAME,
+            backend=EMBEDDING_BACKEND,
+            model_kwargs=model_kwargs
+        )
+    except Exception as e:
+        logger.warning(f"Quantized {EMBEDDING_BACKEND} model not available on the hub: {str(e)}")
+
+    export_quantized_model(EMBEDDING_BACKEND, MODEL_EXPORT_DIR)
+    return SentenceTransformer(
+        MODEL_EXPORT_DIR,
+        backend=EMBEDDING_BACKEND,
+        model_kwargs=model_kwargs
+    )
+
+def warm_up_model() -> bool:
+    """
+    Run dummy forward passes so kernel selection and primitive caching happen
+    at boot instead of on the first request. Quantized backends are also run
+    at the maximum sequence length, where slowdowns and failures show up.
+    Returns whether the model is ready to serve requests.
+    """
+    try:
+        logger.info("Warming up model...")
+        model.encode(["warmup"] * 8, batch_size=8)
+        if EMBEDDING_BACKEND != "torch":
+            model.encode([" ".join(["warmup"] * model.max_seq_length)], batch_size=1)
+        logger.info("Model warmed up successfully")
+        return True
+    except Exception as e:
+        logger.error(f"Error warming up model: {str(e)}")
+        return False
+
+# Initialize the model
+model = load_model()
 logger.info("Model loaded successfully")
+model_ready = warm_up_model()
+VECTOR_SIZE = model.get_sentence_embedding_dimension()
+logger.info(f"Model {MODEL_NAME} produces {VECTOR_SIZE}-dimensional vectors")
 
 # Initialize Qdrant client
 QDRANT_HOST = os.getenv("QDRANT_HOST", "192.168.3.171")
 QDRANT_PORT = int(os.getenv("QDRANT_PORT", "6333"))
 COLLECTION_NAME = "mcp"
+# Keep original FP32 vectors on disk and only the int8 quantized copies in RAM
+QDRANT_VECTORS_ON_DISK = os.getenv("QDRANT_VECTORS_ON_DISK", "false").lower() == "true"
+# Oversampling factor when rescoring int8 candidates with the FP32 vectors
+QDRANT_OVERSAMPLING = float(os.getenv("QDRANT_OVERSAMPLING", "2.0"))
 
 logger.info(f"Connecting to Qdrant at {QDRANT_HOST}:{QDRANT_PORT}...")
-qdrant_client = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
-logger.info("Connected to Qdrant successfully")
-
-# Ensure collection exists
-try:
-    collections = qdrant_client.get_collections().collections
-    collection_names = [c.name for c in collections]
-    if COLLECTION_NAME not in collection_names:
-        logger.info(f"Creating collection {COLLECTION_NAME}...")
-        qdrant_client.create_collection(
-            collection_name=COLLECTION_NAME,
-            vectors_config=VectorParams(size=768, distance=Distance.COSINE)
-        )
-        logger.info("Collection created successfully")
-    else:
-        logger.info(f"Collection {COLLECTION_NAME} already exists")
-except Exception as e:
-    logger.error(f"Error setting up Qdrant collection: {str(e)}")
-    raise
+qdrant_client = AsyncQdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
+
+@app.on_event("startup")
+async def ensure_collection() -> None:
+    """
+    Create the Qdrant collection on startup if it does not exist yet.
+    """
+    try:
+        collections = (await qdrant_client.get_collections()).collections
+        collection_names = [c.name for c in collections]
+        if COLLECTION_NAME not in collection_names:
+            logger.info(f"Creating collection {COLLECTION_NAME}...")
+            await qdrant_client.create_collection(
+                collection_name=COLLECTION_NAME,
+                vectors_config=VectorParams(
+                    size=VECTOR_SIZE,
+                    distance=Distance.COSINE,
+                    on_disk=QDRANT_VECTORS_ON_DISK
+                ),
+                quantization_config=ScalarQuantization(
+                    scalar=ScalarQuantizationConfig(
+                        type=ScalarType.INT8,
+                        quantile=0.99,
+                        always_ram=True
+                    )
+                )
+            )
+            logger.info("Collection created successfully")
+        else:
+            logger.info(f"Collection {COLLECTION_NAME} already exists")
+            collection = await qdrant_client.get_collection(COLLECTION_NAME)
+            existing_size = getattr(collection.config.params.vectors, "size", None)
+            if existing_size != VECTOR_SIZE:
+                raise RuntimeError(
+                    f"Collection {COLLECTION_NAME} stores {existing_size}-dimensional vectors "
+                    f"but {MODEL_NAME} produces {VECTOR_SIZE}-dimensional ones; set EMBED_MODEL "
+                    f"to the model the collection was built with or recreate the collection"
+                )
+        logger.info("Connected to Qdrant successfully")
+    except Exception as e:
+        logger.error(f"Error setting up Qdrant collection: {str(e)}")
+        raise
+
+async def collect_batch(queue: asyncio.Queue, max_size: int, max_wait_ms: float) -> list:
+    """
+    Wait for one item on the queue, then keep collecting items until
+    max_size items are gathered or max_wait_ms milliseconds have passed.
+    """
+    loop = asyncio.get_running_loop()
+    batch = [await queue.get()]
+    deadline = loop.time() + max_wait_ms / 1000
+    while len(batch) < max_size:
+        timeout = deadline - loop.time()
+        if timeout <= 0:
+            break
+        try:
+            batch.append(await asyncio.wait_for(queue.get(), timeout))
+        except asyncio.TimeoutError:
+            break
+    return batch
+
+# Micro-batching configuration
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "32"))
+EMBED_BATCH_MAX_WAIT_MS = float(os.getenv("EMBED_BATCH_MAX_WAIT_MS", "5"))
+
+# Pending (text, future) pairs, created on startup inside the running loop
+embed_queue: "asyncio.Queue[tuple[str, asyncio.Future]]"
+batch_encoder_task: "asyncio.Task[None]"
+
+# Thread pool running model.encode off the event loop. Each encode already
+# uses every core through the backend's intra-op threads, so only a few
+# batches run at once; the rest wait in the queue and coalesce into full batches
+ENCODE_WORKERS = int(os.getenv("ENCODE_WORKERS", "1"))
+encode_executor = ThreadPoolExecutor(max_workers=ENCODE_WORKERS)
+# Free encode slots, created on startup inside the running loop
+encode_slots: asyncio.Semaphore
+# Batches currently being encoded, referenced so their tasks are not collected
+encode_tasks: "set[asyncio.Task[None]]" = set()
+
+def encode_sync(texts: list[str]) -> np.ndarray:
+    """
+    Encode a batch of texts with the model; runs in the encode thread pool.
+    """
+    return model.encode(
+        texts,
+        batch_size=EMBED_BATCH_SIZE,
+        convert_to_numpy=True
+    )
+
+async def encode_batch(texts: list[str], futures: list[asyncio.Future]) -> None:
+    """
+    Encode one batch in the thread pool and resolve each text's future.
+    Releases the encode slot taken by the batch encoder when done.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        embeddings = await loop.run_in_executor(encode_executor, encode_sync, texts)
+    except Exception as e:
+        logger.error(f"Error encoding batch of {len(texts)} texts: {str(e)}")
+        for future in futures:
+            if not future.done():
+                future.set_exception(e)
+        return
+    finally:
+        encode_slots.release()
+
+    for future, embedding in zip(futures, embeddings):
+        if not future.done():
+            future.set_result(embedding)
+
+async def batch_encoder() -> None:
+    """
+    Drain pending texts from the embedding queue and encode them together.
+    Collects up to EMBED_BATCH_SIZE texts or waits at most
+    EMBED_BATCH_MAX_WAIT_MS, then hands the batch to the thread pool. A new
+    batch is only collected once an encode slot is free, so texts arriving
+    while all workers are busy are encoded together in the next batch.
+    """
+    while True:
+        await encode_slots.acquire()
+        batch = await collect_batch(embed_queue, EMBED_BATCH_SIZE, EMBED_BATCH_MAX_WAIT_MS)
+        texts = [text for text, _ in batch]
+        futures = [future for _, future in batch]
+        task = asyncio.create_task(encode_batch(texts, futures))
+        encode_tasks.add(task)
+        task.add_done_callback(encode_tasks.discard)
+
+async def encode(text: str) -> np.ndarray:
+    """
+    Queue a text for the batch encoder and wait for its embedding.
+    """
+    future = asyncio.get_running_loop().create_future()
+    await embed_queue.put((text, future))
+    return await future
+
+async def encode_many(texts: list[str]) -> list[np.ndarray]:
+    """
+    Queue several texts for the batch encoder and wait for all embeddings.
+    """
+    loop = asyncio.get_running_loop()
+    futures = []
+    for text in texts:
+        future = loop.create_future()
+        await embed_queue.put((text, future))
+        futures.append(future)
+    return await asyncio.gather(*futures)
+
+# LRU cache of query embeddings keyed on the BLAKE2 digest of the query text
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "10000"))
+query_cache: "OrderedDict[bytes, bytes]" = OrderedDict()
+
+async def encode_query(query: str) -> np.ndarray:
+    """
+    Return the embedding for a search query, reusing cached embeddings for
+    repeated queries instead of running another forward pass.
+    """
+    key = hashlib.blake2b(query.encode("utf-8"), digest_size=16).digest()
+    cached = query_cache.get(key)
+    if cached is not None:
+        query_cache.move_to_end(key)
+        return np.frombuffer(cached, dtype=np.float32)
+
+    query_vector = await encode(query)
+    query_cache[key] = query_vector.astype(np.float32).tobytes()
+    if len(query_cache) > QUERY_CACHE_SIZE:
+        query_cache.popitem(last=False)
+    return query_vector
+
+@app.on_event("startup")
+async def start_batch_encoder() -> None:
+    """
+    Create the embedding queue and start the background batch encoder.
+    """
+    global embed_queue, encode_slots, batch_encoder_task
+    embed_queue = asyncio.Queue()
+    encode_slots = asyncio.Semaphore(ENCODE_WORKERS)
+    batch_encoder_task = asyncio.create_task(batch_encoder())
+    logger.info(f"Batch encoder started (batch size {EMBED_BATCH_SIZE}, max wait {EMBED_BATCH_MAX_WAIT_MS} ms)")
+
+# Write-batching configuration
+UPSERT_BATCH_SIZE = int(os.getenv("UPSERT_BATCH_SIZE", "256"))
+UPSERT_MAX_WAIT_MS = float(os.getenv("UPSERT_MAX_WAIT_MS", "50"))
+UPSERT_MAX_RETRIES = int(os.getenv("UPSERT_MAX_RETRIES", "3"))
+UPSERT_RETRY_BACKOFF_MS = float(os.getenv("UPSERT_RETRY_BACKOFF_MS", "500"))
+# Ids of accepted points that could not be written, with the last error
+FAILED_POINTS_MAX = int(os.getenv("FAILED_POINTS_MAX", "10000"))
+failed_points: "OrderedDict[str, str]" = OrderedDict()
+
+# Points accepted by /store that have not been written to Qdrant yet;
+# None is queued on shutdown to tell the upserter to stop
+upsert_queue: "asyncio.Queue[PointStruct | None]"
+batch_upserter_task: "asyncio.Task[None]"
+
+async def upsert_with_retry(points: list[PointStruct], wait: bool) -> None:
+    """
+    Write points to Qdrant, retrying up to UPSERT_MAX_RETRIES times with
+    exponential backoff. Points that still fail are recorded in failed_points
+    so clients polling /store/{point_id} can see the failure.
+    """
+    for attempt in range(UPSERT_MAX_RETRIES + 1):
+        try:
+            await qdrant_client.upsert(
+                collection_name=COLLECTION_NAME,
+                points=points,
+                wait=wait
+            )
+            logger.debug("Stored batch of %d code snippets", len(points))
+            return
+        except Exception as e:
+            error = str(e)
+            if attempt < UPSERT_MAX_RETRIES:
+                delay = UPSERT_RETRY_BACKOFF_MS * 2 ** attempt / 1000
+                logger.warning(f"Error storing batch of {len(points)} code snippets, retrying in {delay:.1f} s: {error}")
+                await asyncio.sleep(delay)
+
+    logger.error(f"Giving up on batch of {len(points)} code snippets: {error}")
+    for point in points:
+        failed_points[str(point.id)] = error
+    while len(failed_points) > FAILED_POINTS_MAX:
+        failed_points.popitem(last=False)
+
+async def batch_upserter() -> None:
+    """
+    Drain accepted points from the upsert queue and write them to Qdrant
+    in batches of up to UPSERT_BATCH_SIZE points. Returns once the stop
+    sentinel is reached, after writing the points collected before it.
+    """
+    while True:
+        batch = await collect_batch(upsert_queue, UPSERT_BATCH_SIZE, UPSERT_MAX_WAIT_MS)
+        points = [point for point in batch if point is not None]
+        if points:
+            await upsert_with_retry(points, wait=False)
+        if len(points) != len(batch):
+            return
+
+@app.on_event("startup")
+async def start_batch_upserter() -> None:
+    """
+    Create the upsert queue and start the background batch upserter.
+    """
+    global upsert_queue, batch_upserter_task
+    upsert_queue = asyncio.Queue()
+    batch_upserter_task = asyncio.create_task(batch_upserter())
+    logger.info(f"Batch upserter started (batch size {UPSERT_BATCH_SIZE}, max wait {UPSERT_MAX_WAIT_MS} ms)")
+
+@app.on_event("shutdown")
+async def flush_upsert_queue() -> None:
+    """
+    Stop the batch upserter once it has written the points it already
+    collected, then write any points still waiting in the queue.
+    """
+    await upsert_queue.put(None)
+    await batch_upserter_task
+    points = []
+    while not upsert_queue.empty():
+        point = upsert_queue.get_nowait()
+        if point is not None:
+            points.append(point)
+    if points:
+        logger.info(f"Flushing {len(points)} pending code snippets...")
+        await upsert_with_retry(points, wait=True)
+    await qdrant_client.close()
+
+def json_response(content: dict) -> Response:
+    """
+    Serialize a response containing numpy arrays with orjson, skipping the
+    per-float Python conversion of tolist() and FastAPI's jsonable_encoder.
+    """
+    return Response(
+        content=orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY),
+        media_type="application/json"
+    )
+
+class EmbeddingDtype(str, Enum):
+    fp32 = "fp32"
+    fp16 = "fp16"
+    int8 = "int8"
+
+def pack_embedding(embedding: np.ndarray, dtype: EmbeddingDtype) -> dict:
+    """
+    Encode an embedding for the wire. fp32 is returned as a JSON array; fp16
+    and int8 are returned as base64 little-endian bytes, with int8 scaled by
+    max-abs to [-127, 127] so that vector = int8_values * scale.
+    """
+    if dtype == EmbeddingDtype.fp16:
+        data = embedding.astype("<f2").tobytes()
+        return {"embedding": base64.b64encode(data).decode("ascii"), "dtype": dtype.value}
+    if dtype == EmbeddingDtype.int8:
+        max_abs = float(np.abs(embedding).max())
+        scale = max_abs / 127 if max_abs > 0 else 1.0
+        quantized = np.clip(np.rint(embedding / scale), -127, 127).astype(np.int8)
+        return {
+            "embedding": base64.b64encode(quantized.tobytes()).decode("ascii"),
+            "dtype": dtype.value,
+            "scale": scale
+        }
+    return {"embedding": embedding}
 
 class TextInput(BaseModel):
     text: str
 
+class TextBatch(BaseModel):
+    texts: list[str]
+
 class CodeSnippet(BaseModel):
     code: str
     language: str = "typescript"
@@ -63,52 +457,124 @@ class CodeSnippet(BaseModel):
     tags: list[str] = []
 
 @app.post("/embed")
-async def get_embedding(input: TextInput):
+async def get_embedding(input: TextInput, dtype: EmbeddingDtype = EmbeddingDtype.fp32):
     """
     Generate embeddings for the input text using sentence-transformers.
-    Returns 768-dimensional vectors for better code representation.
+    Returns VECTOR_SIZE-dimensional vectors (384 for the default MiniLM model).
+    Use dtype=fp16 or dtype=int8 to receive a smaller base64-encoded vector.
+    """
+    try:
+        logger.debug("Processing text: %.100s...", input.text)
+        embedding = await encode(input.text)
+        logger.debug("Embedding generated successfully - shape: %s", embedding.shape)
+        return json_response(pack_embedding(embedding, dtype))
+    except Exception as e:
+        logger.error(f"Error generating embedding: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/embed_bytes")
+async def get_embedding_bytes(input: TextInput):
+    """
+    Generate an embedding for the input text and return it as raw
+    little-endian float32 bytes, so internal callers can skip JSON entirely.
     """
     try:
-        logger.info(f"Processing text: {input.text[:100]}...")
-        embedding = model.encode(input.text)
-        logger.info(f"Embedding generated successfully - shape: {embedding.shape}")
-        return {"embedding": embedding.tolist()}
+        logger.debug("Processing text: %.100s...", input.text)
+        embedding = await encode(input.text)
+        logger.debug("Embedding generated successfully - shape: %s", embedding.shape)
+        return Response(
+            content=embedding.astype("<f4").tobytes(),
+            media_type="application/octet-stream"
+        )
     except Exception as e:
         logger.error(f"Error generating embedding: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/store")
+@app.post("/embed_batch")
+async def embed_batch(batch: TextBatch):
+    """
+    Generate embeddings for a list of texts in as few forward passes as possible.
+    Texts share the batching queue with /embed, so mixed traffic is coalesced.
+    Batches of 32-64 texts per request work best for transformer models on CPU.
+    """
+    try:
+        logger.debug("Processing batch of %d texts...", len(batch.texts))
+        embeddings = await encode_many(batch.texts)
+        logger.debug("Batch embeddings generated successfully - count: %d", len(embeddings))
+        return json_response({"embeddings": embeddings})
+    except Exception as e:
+        logger.error(f"Error generating batch embeddings: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def build_point(snippet: CodeSnippet) -> PointStruct:
+    """
+    Embed a code snippet and wrap it in a Qdrant point with a fresh UUID.
+    """
+    logger.debug("Generating embedding for code snippet: %.100s...", snippet.code)
+    embedding = await encode(snippet.code)
+    return PointStruct(
+        id=str(uuid.uuid4()),
+        vector=embedding.tolist(),
+        payload={
+            "code": snippet.code,
+            "language": snippet.language,
+            "description": snippet.description,
+            "tags": snippet.tags
+        }
+    )
+
+@app.post("/store", status_code=202)
 async def store_code(snippet: CodeSnippet):
     """
-    Store a code snippet in the Qdrant collection.
+    Queue a code snippet for storage in the Qdrant collection.
+    Returns as soon as the snippet is embedded; the point is written by the
+    background batch upserter. Poll /store/{point_id} for the outcome, or
+    use /store_sync to wait for the write.
     """
     try:
-        # Generate embedding for the code
-        logger.info(f"Generating embedding for code snippet: {snippet.code[:100]}...")
-        embedding = model.encode(snippet.code)
-        
-        # Create a unique ID for the point
-        point_id = str(uuid.uuid4())
-        
-        # Store in Qdrant
-        logger.info(f"Storing code snippet with ID {point_id}...")
-        qdrant_client.upsert(
+        point = await build_point(snippet)
+        logger.debug("Queueing code snippet with ID %s...", point.id)
+        await upsert_queue.put(point)
+        return {"id": point.id, "status": "accepted"}
+    except Exception as e:
+        logger.error(f"Error storing code snippet: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/store/{point_id}")
+async def store_status(point_id: str):
+    """
+    Report whether a snippet accepted by /store has been written to Qdrant:
+    "success" once stored, "failed" if all retries failed, else "pending".
+    """
+    if point_id in failed_points:
+        return {"id": point_id, "status": "failed", "error": failed_points[point_id]}
+    try:
+        points = await qdrant_client.retrieve(
             collection_name=COLLECTION_NAME,
-            points=[
-                PointStruct(
-                    id=point_id,
-                    vector=embedding.tolist(),
-                    payload={
-                        "code": snippet.code,
-                        "language": snippet.language,
-                        "description": snippet.description,
-                        "tags": snippet.tags
-                    }
-                )
-            ]
+            ids=[point_id],
+            with_payload=False,
+            with_vectors=False
         )
-        logger.info("Code snippet stored successfully")
-        return {"id": point_id, "status": "success"}
+        return {"id": point_id, "status": "success" if points else "pending"}
+    except Exception as e:
+        logger.error(f"Error checking code snippet {point_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/store_sync")
+async def store_code_sync(snippet: CodeSnippet):
+    """
+    Store a code snippet in the Qdrant collection and wait for the write.
+    """
+    try:
+        point = await build_point(snippet)
+        logger.debug("Storing code snippet with ID %s...", point.id)
+        await qdrant_client.upsert(
+            collection_name=COLLECTION_NAME,
+            points=[point],
+            wait=True
+        )
+        logger.debug("Code snippet stored successfully")
+        return {"id": point.id, "status": "success"}
     except Exception as e:
         logger.error(f"Error storing code snippet: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -120,31 +586,31 @@ async def search_code(query: str, limit: int = 5):
     """
     try:
         # Generate embedding for the query
-        logger.info(f"Generating embedding for search query: {query}")
-        query_vector = model.encode(query)
+        logger.debug("Generating embedding for search query: %.100s", query)
+        query_vector = await encode_query(query)
         
         # Search in Qdrant
-        logger.info("Searching for similar code snippets...")
-        search_results = qdrant_client.search(
+        logger.debug("Searching for similar code snippets...")
+        search_results = await qdrant_client.search(
             collection_name=COLLECTION_NAME,
-            query_vector=query_vector.tolist(),
-            limit=limit
+            query_vector=query_vector,
+            limit=limit,
+            search_params=SearchParams(
+                quantization=QuantizationSearchParams(
+                    rescore=True,
+                    oversampling=QDRANT_OVERSAMPLING
+                )
+            )
         )
         
-        # Format results
-        results = []
-        for hit in search_results:
-            results.append({
-                "id": hit.id,
-                "score": hit.score,
-                "code": hit.payload["code"],
-                "language": hit.payload["language"],
-                "description": hit.payload["description"],
-                "tags": hit.payload["tags"]
-            })
+        # Format results - payload fields first so they cannot shadow id/score
+        results = [
+            {**hit.payload, "id": hit.id, "score": hit.score}
+            for hit in search_results
+        ]
         
-        logger.info(f"Found {len(results)} matching code snippets")
-        return {"results": results}
+        logger.debug("Found %d matching code snippets", len(results))
+        return json_response({"results": results})
     except Exception as e:
         logger.error(f"Error searching code snippets: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -153,12 +619,21 @@ async def search_code(query: str, limit: int = 5):
 async def health_check():
     """
     Health check endpoint to verify the service is running.
+    Reports unhealthy until the model has been warmed up.
     """
+    if not model_ready:
+        raise HTTPException(status_code=503, detail="Model warmup failed")
     return {
         "status": "healthy", 
-        "model": "sentence-transformers/all-mpnet-base-v2",
-        "vector_size": 768
+        "model": MODEL_NAME,
+        "backend": EMBEDDING_BACKEND,
+        "vector_size": VECTOR_SIZE
     }
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        log_level=os.getenv("UVICORN_LOG_LEVEL", "warning")
+    ) 
\ No newline at end of file
@@ -0,0 +1,72 @@
+from sentence_transformers import (
+    SentenceTransformer,
+    export_dynamic_quantized_onnx_model,
+    export_static_quantized_openvino_model,
+)
+import json
+import logging
+import os
+import sys
+
+logger = logging.getLogger(__name__)
+
+# Model configuration - MiniLM produces 384-dimensional vectors; set
+# EMBED_MODEL=sentence-transformers/all-mpnet-base-v2 for 768-dimensional ones
+MODEL_NAME = os.getenv("EMBED_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+
+# Quantized int8 weight files per backend, relative to the model directory
+QUANTIZED_MODEL_FILES = {
+    # Dynamically quantized ONNX weights (AVX-512 VNNI kernels)
+    "onnx": "onnx/model_qint8_avx512_vnni.onnx",
+    # Statically quantized OpenVINO IR (VNNI/AMX kernels on Intel CPUs)
+    "openvino": "openvino/openvino_model_qint8_quantized.xml",
+}
+
+# Records which model and backends an export directory holds
+EXPORT_INFO_FILE = "export_info.json"
+
+def read_export_info(output_dir: str) -> dict:
+    """
+    Return the model and backends recorded for an export directory,
+    or an empty dict if nothing has been exported there.
+    """
+    path = os.path.join(output_dir, EXPORT_INFO_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def export_quantized_model(backend: str, output_dir: str) -> None:
+    """
+    Export MODEL_NAME with int8 weights for the given backend into output_dir.
+    The result can be loaded with SentenceTransformer(output_dir, backend=backend,
+    model_kwargs={"file_name": QUANTIZED_MODEL_FILES[backend]}).
+    """
+    if backend not in QUANTIZED_MODEL_FILES:
+        raise ValueError(f"Unsupported backend for quantized export: {backend}")
+
+    logger.info(f"Exporting {MODEL_NAME} with {backend} backend to {output_dir}...")
+    base_model = SentenceTransformer(MODEL_NAME, backend=backend)
+    base_model.save_pretrained(output_dir)
+    if backend == "onnx":
+        export_dynamic_quantized_onnx_model(base_model, "avx512_vnni", output_dir)
+    else:
+        export_static_quantized_openvino_model(base_model, None, output_dir)
+
+    info = read_export_info(output_dir)
+    if info.get("model") != MODEL_NAME:
+        info = {"model": MODEL_NAME, "backends": []}
+    if backend not in info["backends"]:
+        info["backends"].append(backend)
+    with open(os.path.join(output_dir, EXPORT_INFO_FILE), "w") as f:
+        json.dump(info, f)
+    logger.info("Quantized model exported successfully")
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    if len(sys.argv) != 3:
+        sys.exit(f"Usage: {sys.argv[0]} <onnx|openvino> <output_dir>")
+    export_quantized_model(sys.argv[1], os.path.abspath(sys.argv[2]))
@@ -16,7 +16,7 @@ const configSchema = z.object({
   QDRANT_URL: z.string().url().default('http://192.168.3.171:6333'),
   QDRANT_API_KEY: z.string().optional(),
   QDRANT_COLLECTION: z.string().default('mcp'),
-  QDRANT_VECTOR_SIZE: z.number().int().positive().default(768),
+  QDRANT_VECTOR_SIZE: z.number().int().positive().default(384),
   
   // Embedding service configuration
   EMBEDDING_API_URL: z.string().url().default('http://192.168.3.171:8000/embed'),
@@ -4,29 +4,106 @@ This module implements a conversational agent with memory and tools for
 enhanced interactions.
 """
 
+import asyncio
 import os
-from typing import List, Dict, Optional, Union, cast
+import threading
+from collections import deque
+from typing import Deque, List, Dict, Optional, Sequence, Union, cast
 from pydantic import SecretStr
 from dotenv import load_dotenv
+from cachetools import TTLCache
+from cachetools.func import ttl_cache
 
-from langchain_community.tools import DuckDuckGoSearchRun
+from langchain_community.tools import DuckDuckGoSearchResults
 from langchain_core.chat_history import BaseChatMessageHistory
 from langchain_core.runnables import Runnable, RunnableConfig
 from langchain_core.runnables.history import RunnableWithMessageHistory
+from langchain_core.tools import BaseTool
 from langchain_core.tracers import ConsoleCallbackHandler
 from langchain_ollama import ChatOllama
 from langchain_openai import ChatOpenAI
 
 from langchain.agents import AgentExecutor, create_openai_functions_agent
-from langchain.memory import ConversationBufferMemory
 from langchain.prompts import MessagesPlaceholder, ChatPromptTemplate
 from langchain.schema import SystemMessage, BaseMessage
 
 # Load environment variables
 load_dotenv()
 
+# Underlying web search tool, wrapped by CachedSearchTool
+duckduckgo_search = DuckDuckGoSearchResults()
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query so equivalent queries share a cache entry.
+
+    Args:
+        query: The raw search query.
+
+    Returns:
+        The lowercased query with collapsed whitespace.
+    """
+    return " ".join(query.lower().split())
+
+
+# Seconds a cached search result is reused before searching again
+SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", "600"))
+
+
+@ttl_cache(maxsize=1024, ttl=SEARCH_CACHE_TTL)
+def cached_search(query: str) -> str:
+    """Run a web search, memoizing results per normalized query.
+
+    Results expire after SEARCH_CACHE_TTL seconds so answers about current
+    events do not go stale.
+
+    Args:
+        query: The normalized search query.
+
+    Returns:
+        The search results.
+    """
+    return duckduckgo_search.run(query)
+
+
+class CachedSearchTool(BaseTool):
+    """Web search tool that reuses results for repeated queries.
+
+    Searches run in a worker thread when the agent executes asynchronously,
+    so the event loop is not blocked by the outbound HTTP request.
+    """
+
+    name: str = "web_search"
+    description: str = (
+        "Search the web with DuckDuckGo. Useful for answering questions "
+        "about current events. Input should be a search query."
+    )
+
+    def _run(self, query: str) -> str:
+        """Run the search synchronously.
+
+        Args:
+            query: The search query.
+
+        Returns:
+            The search results.
+        """
+        return cached_search(normalize_query(query))
+
+    async def _arun(self, query: str) -> str:
+        """Run the search in a worker thread.
+
+        Args:
+            query: The search query.
+
+        Returns:
+            The search results.
+        """
+        return await asyncio.to_thread(cached_search, normalize_query(query))
+
+
 # Initialize tools
-search = DuckDuckGoSearchRun()
+search = CachedSearchTool()
 tools = [search]
 
 # Create system message
@@ -84,8 +161,59 @@ agent_executor = AgentExecutor(
     callbacks=[ConsoleCallbackHandler()],
 )
 
-# Store memory instances
-memory_store: Dict[str, BaseChatMessageHistory] = {}
+# Number of most recent messages kept per session and sent with each prompt
+HISTORY_WINDOW = int(os.getenv("HISTORY_WINDOW", "20"))
+
+
+class WindowedChatMessageHistory(BaseChatMessageHistory):
+    """Chat history that keeps only the most recent messages.
+
+    Messages are stored in a ring buffer, so memory use and the prompt size
+    stay constant regardless of conversation length.
+    """
+
+    def __init__(self, window: int = HISTORY_WINDOW) -> None:
+        """Initialize an empty history.
+
+        Args:
+            window: The maximum number of messages to keep.
+        """
+        self._messages: Deque[BaseMessage] = deque(maxlen=window)
+
+    @property
+    def messages(self) -> List[BaseMessage]:  # type: ignore[override]
+        """Return the retained messages, oldest first."""
+        return list(self._messages)
+
+    def add_message(self, message: BaseMessage) -> None:
+        """Add a message, evicting the oldest one if the window is full.
+
+        Args:
+            message: The message to add.
+        """
+        self._messages.append(message)
+
+    def add_messages(self, messages: Sequence[BaseMessage]) -> None:
+        """Add several messages, evicting the oldest ones as needed.
+
+        Args:
+            messages: The messages to add.
+        """
+        self._messages.extend(messages)
+
+    def clear(self) -> None:
+        """Remove all messages."""
+        self._messages.clear()
+
+
+# Store memory instances, evicting idle sessions to bound memory use
+MEMORY_STORE_SIZE = int(os.getenv("MEMORY_STORE_SIZE", "1000"))
+MEMORY_STORE_TTL = int(os.getenv("MEMORY_STORE_TTL", "3600"))
+memory_store: "TTLCache[str, BaseChatMessageHistory]" = TTLCache(
+    maxsize=MEMORY_STORE_SIZE, ttl=MEMORY_STORE_TTL
+)
+# Guards memory_store against concurrent access from Gradio worker threads
+memory_store_lock = threading.Lock()
 
 
 def create_memory(session_id: str) -> BaseChatMessageHistory:
@@ -97,13 +225,13 @@ def create_memory(session_id: str) -> BaseChatMessageHistory:
     Returns:
         A chat message history instance.
     """
-    if session_id not in memory_store:
-        memory = ConversationBufferMemory(
-            return_messages=True,
-            memory_key="chat_history",
-        )
-        memory_store[session_id] = memory.chat_memory
-    return memory_store[session_id]
+    with memory_store_lock:
+        memory = memory_store.get(session_id)
+        if memory is None:
+            memory = WindowedChatMessageHistory()
+        # Re-inserting refreshes the session's time-to-live
+        memory_store[session_id] = memory
+        return memory
 
 
 # Configure message history with tracing
@@ -151,7 +279,8 @@ def get_chat_history() -> List[BaseMessage]:
         List of BaseMessage objects containing the chat history.
     """
     session_id = "default_session"
-    memory = memory_store.get(session_id)
+    with memory_store_lock:
+        memory = memory_store.get(session_id)
     return memory.messages if memory else []
 
 
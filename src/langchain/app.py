@@ -6,15 +6,19 @@ conversation state, and UI interactions.
 """
 
 from contextlib import contextmanager
-from typing import Any, Dict, Generator, List, Tuple
+from typing import Any, AsyncGenerator, Dict, Generator, List, Tuple, Union
+from uuid import UUID
 import gradio as gr
 import networkx as nx  # type: ignore
-from langchain_core.messages import BaseMessage, HumanMessage
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
 from langchain_core.tracers import BaseTracer
 from langchain_core.tracers.schemas import Run
 
 from agent import chain
 
+# Session used for the agent's message history
+SESSION_ID = "default_session"
+
 
 def format_message(msg: BaseMessage) -> str:
     """Format a message for display.
@@ -33,11 +37,34 @@ def format_message(msg: BaseMessage) -> str:
 class GraphTracer(BaseTracer):
     """Custom tracer for creating execution graphs."""
 
+    __slots__ = ("graph", "runs", "_runs_by_id", "_nodes", "_edges")
+
     def __init__(self) -> None:
         """Initialize the tracer with an empty graph."""
         super().__init__()
         self.graph = nx.DiGraph()
         self.runs: List[Run] = []
+        self._runs_by_id: Dict[UUID, Run] = {}
+        # Flat node/edge records for visualization, kept alongside the graph
+        self._nodes: List[Dict[str, Any]] = []
+        self._edges: List[Tuple[Any, Any]] = []
+
+    def _index_run(self, run: Run) -> bool:
+        """Record a run once, keeping the list and the id index in sync.
+
+        Args:
+            run: The run to record.
+
+        Returns:
+            True if the run was not recorded before.
+        """
+        runs_by_id = self._runs_by_id
+        run_id = run.id
+        if run_id in runs_by_id:
+            return False
+        runs_by_id[run_id] = run
+        self.runs.append(run)
+        return True
 
     def _persist_run(self, run: Run) -> None:
         """Persist a run to storage.
@@ -46,13 +73,13 @@ class GraphTracer(BaseTracer):
             run: The run to persist.
         """
         # In-memory persistence
-        self.runs.append(run)
+        self._index_run(run)
 
-    def load_run(self, run_id: str) -> Run:
+    def load_run(self, run_id: Union[str, UUID]) -> Run:
         """Load a run from storage.
 
         Args:
-            run_id: The ID of the run to load.
+            run_id: The ID of the run to load, as a UUID or its string form.
 
         Returns:
             The loaded run.
@@ -60,48 +87,50 @@ class GraphTracer(BaseTracer):
         Raises:
             KeyError: If the run is not found.
         """
-        for run in self.runs:
-            if run.id == run_id:
-                return run
-        raise KeyError(f"Run {run_id} not found")
+        try:
+            return self._runs_by_id[UUID(str(run_id))]
+        except (KeyError, ValueError):
+            raise KeyError(f"Run {run_id} not found") from None
 
-    def on_run_create(self, run: Run) -> None:
+    def _on_run_create(self, run: Run) -> None:
         """Handle run creation by adding it to the graph.
 
+        Called by BaseTracer whenever a run starts.
+
         Args:
             run: The run to add to the graph.
         """
-        self.runs.append(run)
-        self.graph.add_node(run.id, label=run.name, type=run.run_type)
-        if run.parent_run_id:
-            self.graph.add_edge(run.parent_run_id, run.id)
-
-    def on_run_update(self, run: Run) -> None:
-        """Handle run updates.
+        graph = self.graph
+        run_id = run.id
+        name = run.name
+        run_type = run.run_type
+        parent_run_id = run.parent_run_id
+
+        is_new = self._index_run(run)
+        graph.add_node(run_id, label=name, type=run_type)
+        if parent_run_id:
+            graph.add_edge(parent_run_id, run_id)
+        if is_new:
+            self._nodes.append({"id": run_id, "label": name, "type": run_type})
+            if parent_run_id:
+                self._edges.append((parent_run_id, run_id))
+
+    def _on_run_update(self, run: Run) -> None:
+        """Handle run completion by recording its final status.
+
+        Called by BaseTracer whenever a run ends or errors.
 
         Args:
             run: The updated run.
         """
-        # Update node attributes if needed
+        nodes = self.graph.nodes
+        run_id = run.id
+        if run_id not in nodes:
+            return
+        node = nodes[run_id]
         if hasattr(run, 'status'):
-            self.graph.nodes[run.id].update({"status": run.status})
-
-    def on_run_end(self, run: Run) -> None:
-        """Handle run completion.
-
-        Args:
-            run: The completed run.
-        """
-        # Update node attributes with final status
-        if hasattr(run, 'status'):
-            self.graph.nodes[run.id].update({
-                "status": run.status,
-                "end_time": run.end_time
-            })
-        else:
-            self.graph.nodes[run.id].update({
-                "end_time": run.end_time
-            })
+            node["status"] = run.status
+        node["end_time"] = run.end_time
 
     def get_graph_data(self) -> Dict[str, Any]:
         """Get the graph data in a format suitable for visualization.
@@ -110,18 +139,8 @@ class GraphTracer(BaseTracer):
             A dictionary containing nodes and edges of the graph.
         """
         return {
-            "nodes": [
-                {
-                    "id": node,
-                    "label": self.graph.nodes[node]["label"],
-                    "type": self.graph.nodes[node]["type"]
-                }
-                for node in self.graph.nodes
-            ],
-            "edges": [
-                {"from": u, "to": v}
-                for u, v in self.graph.edges
-            ]
+            "nodes": list(self._nodes),
+            "edges": [{"from": u, "to": v} for u, v in self._edges]
         }
 
     @contextmanager
@@ -141,13 +160,16 @@ class GraphTracer(BaseTracer):
         """Start tracing execution."""
         self.graph.clear()
         self.runs.clear()
+        self._runs_by_id.clear()
+        self._nodes.clear()
+        self._edges.clear()
 
     def end_trace(self) -> None:
         """End tracing execution."""
         # Ensure all runs are properly finalized
         for run in self.runs:
             if not run.end_time:
-                self.on_run_end(run)
+                self._on_run_update(run)
 
 
 class Conversation:
@@ -160,41 +182,88 @@ class Conversation:
     def __init__(self) -> None:
         """Initialize an empty conversation."""
         self.messages: List[BaseMessage] = []
+        # Formatted messages, rendered once each and reused across turns
+        self._rendered: List[str] = []
         self._last_response: str = ""
         self.tracer = GraphTracer()
 
-    def chat(self, user_input: str) -> Tuple[str, Dict[str, Any]]:
-        """Process a user message and return the formatted conversation.
+    async def stream_chat(
+        self, user_input: str
+    ) -> AsyncGenerator[Tuple[str, Dict[str, Any]], None]:
+        """Process a user message, yielding the conversation as it streams.
 
         Args:
             user_input: The user's message text.
 
-        Returns:
-            A tuple containing:
-                - A formatted string containing the entire conversation history
+        Yields:
+            Tuples containing:
+                - The formatted conversation including the partial reply
                 - A dictionary containing graph visualization data
         """
         # Add user message
         self.messages.append(HumanMessage(content=user_input))
+        self._rendered.append(format_message(self.messages[-1]))
+        history = "\n\n".join(self._rendered)
 
         # Reset tracer for new conversation turn
         self.tracer = GraphTracer()
 
-        # Get response from agent with tracing
-        with self.tracer.trace():
-            result = chain.invoke(
-                {"messages": self.messages},
-                {"callbacks": [self.tracer]}
-            )
-            self.messages = result["messages"]
-
-        # Format conversation
-        self._last_response = "\n\n".join(
-            format_message(msg) for msg in self.messages
-        )
-
-        # Return both conversation and graph data
-        return self._last_response, self.tracer.get_graph_data()
+        # Stream model tokens from the agent with tracing. Chunks are reset
+        # whenever the agent starts another model call, so only the current
+        # call's text is shown; the final reply comes from the root run.
+        chunks: List[str] = []
+        root_run_id = None
+        output = None
+        error = None
+        completed = False
+        try:
+            with self.tracer.trace():
+                async for event in chain.astream_events(
+                    {"input": user_input},
+                    {
+                        "configurable": {"session_id": SESSION_ID},
+                        "callbacks": [self.tracer]
+                    },
+                    version="v1"
+                ):
+                    kind = event["event"]
+                    if root_run_id is None:
+                        root_run_id = event["run_id"]
+                    if kind == "on_chat_model_start":
+                        chunks.clear()
+                    elif kind == "on_chat_model_stream":
+                        content = event["data"]["chunk"].content
+                        if content:
+                            chunks.append(content)
+                            yield (
+                                f"{history}\n\nAssistant: {''.join(chunks)}",
+                                self.tracer.get_graph_data()
+                            )
+                    elif kind == "on_chain_end" and event["run_id"] == root_run_id:
+                        output = event["data"].get("output")
+            completed = True
+        except Exception as e:  # pylint: disable=broad-except
+            error = e
+        finally:
+            # Drop the unanswered message if the turn failed or the stream was
+            # closed or cancelled, so the conversation matches agent memory
+            if not completed:
+                self.messages.pop()
+                self._rendered.pop()
+
+        if error is not None:
+            yield f"{history}\n\nError: {error}", self.tracer.get_graph_data()
+            return
+
+        # Record the complete reply
+        if isinstance(output, dict) and "output" in output:
+            reply = str(output["output"])
+        else:
+            reply = "".join(chunks)
+        self.messages.append(AIMessage(content=reply))
+        self._rendered.append(format_message(self.messages[-1]))
+        self._last_response = "\n\n".join(self._rendered)
+        yield self._last_response, self.tracer.get_graph_data()
 
     def get_last_response(self) -> str:
         """Get the last formatted conversation response.
@@ -238,20 +307,24 @@ with gr.Blocks(title="AI Assistant", theme=gr.themes.Soft()) as demo:
             - Click on nodes to see details of each step
             """)
 
-    def process_message(user_text: str) -> Tuple[str, Dict[str, Any]]:
-        """Process a user message and update the chat history and graph.
+    async def process_message(
+        user_text: str
+    ) -> AsyncGenerator[Tuple[str, Dict[str, Any]], None]:
+        """Process a user message, streaming updates to the chat and graph.
 
         Args:
             user_text: The text input from the user.
 
-        Returns:
-            A tuple containing:
+        Yields:
+            Tuples containing:
                 - The updated chat history as a formatted string
                 - The graph visualization data as a dictionary
         """
         if not user_text.strip():
-            return chatbot.value or "", {}
-        return conversation.chat(user_text)
+            yield chatbot.value or "", {}
+            return
+        async for update in conversation.stream_chat(user_text):
+            yield update
 
     # Set up interactions
     # Note: Gradio components have dynamic methods added at runtime
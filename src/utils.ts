@@ -10,7 +10,7 @@ export const QDRANT_SERVER_URL = process.env.QDRANT_URL || 'http://192.168.3.171
 export const QDRANT_API_KEY = process.env.QDRANT_API_KEY;
 export const EMBEDDING_API_URL = process.env.EMBEDDING_API_URL || 'http://192.168.3.171:8000/embed';
 export const COLLECTION_NAME = process.env.QDRANT_COLLECTION || 'mcp';
-export const VECTOR_SIZE = parseInt(process.env.QDRANT_VECTOR_SIZE || '768', 10); // all-mpnet-base-v2 produces 768-dimensional vectors
+export const VECTOR_SIZE = parseInt(process.env.QDRANT_VECTOR_SIZE || '384', 10); // all-MiniLM-L6-v2 produces 384-dimensional vectors
 
 const execPromise = promisify(_exec);
 